@@ -1,8 +1,58 @@
-import json
-import httpx
-from typing import List, Set, Dict
+import aiohttp
+import orjson
+import pygtrie
+from typing import Awaitable, Callable, Iterable, List, Optional, Set, Dict, Tuple
 import asyncio
+import contextlib
+import logging
+from itertools import islice
 import os
+import re
+
+log = logging.getLogger("crawler")
+
+NON_DIGITS = re.compile(r"\D+")
+# Response size in bytes above which JSON is decoded off the event loop
+THREAD_DECODE_THRESHOLD = 4096
+# Requests in flight at once, shared by all crawls; sizes the connection pool as well
+MAX_REQUESTS = 32
+# Attempts per request, and the delay in seconds before the first retry (doubled after each)
+FETCH_ATTEMPTS = 3
+RETRY_DELAY = 1.0
+# Results per page returned by the APIs, and the larger page requested if they honor a custom limit
+DEFAULT_PAGE_SIZE = 12
+CUSTOM_LIMIT = 1000
+# Only every LOG_EVERY-th explored prefix is logged, to keep output off the hot path
+LOG_EVERY = 1000
+
+
+def natural_sort_key(number: str) -> Tuple[int, str]:
+    """Sort key ordering house numbers by their digits, then by the full string."""
+    return int(NON_DIGITS.sub("", number) or 0), number
+
+
+# Shared by every fetcher in the process, so all requests reuse one connection pool
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide HTTP session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        # aiohttp has less per-request overhead than httpx for many small concurrent GETs
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_REQUESTS, limit_per_host=MAX_REQUESTS, ttl_dns_cache=600),
+            timeout=aiohttp.ClientTimeout(total=10, connect=5),
+        )
+    return _SESSION
+
+
+async def close_session():
+    """Close the process-wide HTTP session if it was created."""
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
 
 
 class StuttgartStreetFetcher:
@@ -11,191 +61,421 @@ class StuttgartStreetFetcher:
         self.number_url = "https://service.stuttgart.de/lhs-services/aws/hausnummern"
         self.street_names: Set[str] = set()
         self.completed_queries: Set[str] = set()
-        self.street_numbers: Dict[str, List[str]] = {}
+        # The street API returns 12 results per page unless it honors a custom limit
+        self.street_limit: Optional[int] = None
+        self.street_page_size = DEFAULT_PAGE_SIZE
+        # Same for the house number API
+        self.number_limit: Optional[int] = None
+        self.number_page_size = DEFAULT_PAGE_SIZE
+        # Lowercased street names, so known streets under a prefix can be counted without a request
+        self.street_index = pygtrie.CharTrie()
+        self.street_numbers: Dict[str, Set[str]] = {}
+        # House numbers of streets still being explored; moved to street_numbers once complete
+        self.partial_street_numbers: Dict[str, Set[str]] = {}
         self.completed_number_queries: Set[str] = set()
-        self.client = httpx.AsyncClient()
+        # Pages fetched while probing the house number API, by query key
+        self.probed_number_pages: Dict[str, List[str]] = {}
+        # Progress counters for the sampled log messages
+        self.explored_prefixes = 0
+        self.explored_number_prefixes = 0
+        self.sem = asyncio.Semaphore(MAX_REQUESTS)
+        # Concurrent workers draining the prefix stack of the street crawl and of each street's
+        # house number crawl; the requests they send are still bounded by MAX_REQUESTS overall
+        self.street_workers = MAX_REQUESTS
+        self.number_workers = 10
+        self._default_chars, self._next_chars_table = self._build_next_chars_table()
+        # Append-only logs of new results; compacted into the JSON files by save_results
+        self._streets_log = open("street_names.jsonl", "ab")
+        self._numbers_log = open("street_numbers.jsonl", "ab")
+        self._queries_log = open("completed_queries.jsonl", "ab")
+
+    @staticmethod
+    def _build_next_chars_table() -> Tuple[Tuple[str, ...], Dict[str, Tuple[str, ...]]]:
+        """Precompute the valid next characters keyed on the last character of a prefix."""
+        # German alphabet including umlauts
+        german_chars = "abcdefghijklmnopqrstuvwxyzäöüß"
+
+        # Consonant clusters that are impossible in German
+        impossible_after = {
+            'b': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
+            'c': ['b', 'c', 'd', 'f', 'g', 'j', 'p', 'q', 'v', 'w', 'x', 'y', 'z'],
+            'd': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
+            'f': ['b', 'c', 'd', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
+            'g': ['b', 'c', 'd', 'f', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
+            'k': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
+            'p': ['b', 'c', 'd', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
+            't': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x'],
+            'x': list("abcdefghijklmnopqrstuvwxyzäöüß"),  # x is very rare in German
+            'q': [c for c in german_chars if c != 'u'],  # q almost always followed by u
+        }
+
+        # The empty prefix maps to the full alphabet as well
+        table = {"": tuple(german_chars)}
+        for last_char, impossible in impossible_after.items():
+            table[last_char] = tuple(c for c in german_chars if c not in impossible)
+        return tuple(german_chars), table
+
+    async def fetch_suggestions(self, url: str, params: Dict[str, str]) -> List[str]:
+        """Fetch suggestions, retrying failed requests with exponential backoff."""
+        for attempt in range(FETCH_ATTEMPTS):
+            try:
+                return await self.request_suggestions(url, params)
+            except Exception:
+                if attempt == FETCH_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+
+    async def request_suggestions(self, url: str, params: Dict[str, str]) -> List[str]:
+        """Request suggestions from one of the autocomplete APIs."""
+        async with self.sem:
+            async with get_session().get(url, params=params) as response:
+                response.raise_for_status()
+                raw = await response.read()
+
+        # Decode large payloads (e.g. pages with a custom limit) in a thread to keep the event loop responsive
+        if len(raw) < THREAD_DECODE_THRESHOLD:
+            data = orjson.loads(raw)
+        else:
+            data = await asyncio.to_thread(orjson.loads, raw)
+
+        # Extract the suggested values; malformed data raises and is reported by the caller
+        return [item["data"] for item in data.get("suggestions", ())]
 
-    async def fetch_streets(self, prefix: str) -> List[str]:
-        """Fetch street suggestions for a given prefix."""
+    async def fetch_streets(self, prefix: str, limit: Optional[int] = None) -> Optional[List[str]]:
+        """Fetch street suggestions for a given prefix, or None if the request failed."""
         try:
-            response = await self.client.get(self.street_url, params={"street": prefix})
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract street names from the response
-            street_names = []
-            if isinstance(data, dict) and "suggestions" in data:
-                for item in data["suggestions"]:
-                    if isinstance(item, dict) and "data" in item:
-                        street_names.append(item["data"])
-
-            return street_names
+            params = {"street": prefix}
+            limit = limit or self.street_limit
+            if limit:
+                params["limit"] = str(limit)
+
+            return await self.fetch_suggestions(self.street_url, params)
         except Exception as e:
-            print(f"Error fetching streets for prefix '{prefix}': {e}")
-            return []
+            log.warning("Error fetching streets for prefix '%s': %s", prefix, e)
+            return None
 
-    async def fetch_house_numbers(self, street: str, number_prefix: str = "") -> List[str]:
-        """Fetch house number suggestions for a given street and number prefix."""
+    async def fetch_house_numbers(
+        self, street: str, number_prefix: str = "", limit: Optional[int] = None
+    ) -> Optional[List[str]]:
+        """Fetch house number suggestions for a given street and number prefix, or None if the request failed."""
         try:
             params = {"street": street}
             if number_prefix:
                 params["streetnr"] = number_prefix
+            limit = limit or self.number_limit
+            if limit:
+                params["limit"] = str(limit)
 
-            response = await self.client.get(self.number_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract house numbers from the response
-            house_numbers = []
-            if isinstance(data, dict) and "suggestions" in data:
-                for item in data["suggestions"]:
-                    if isinstance(item, dict) and "data" in item:
-                        house_numbers.append(item["data"])
-
-            return house_numbers
+            return await self.fetch_suggestions(self.number_url, params)
         except Exception as e:
-            print(f"Error fetching house numbers for street '{street}' prefix '{number_prefix}': {e}")
-            return []
+            log.warning("Error fetching house numbers for street '%s' prefix '%s': %s", street, number_prefix, e)
+            return None
 
-    def get_next_characters(self, prefix: str) -> List[str]:
-        """Generate next valid German characters for a prefix."""
-        # German alphabet including umlauts
-        german_chars = "abcdefghijklmnopqrstuvwxyzäöüß"
+    def get_next_characters(self, prefix: str) -> Tuple[str, ...]:
+        """Return the next valid German characters for a prefix."""
+        return self._next_chars_table.get(prefix[-1:].lower(), self._default_chars)
+
+    async def explore_house_numbers(self, street: str, number_prefix: str = "") -> Optional[bool]:
+        """Explore the house numbers for a street and number prefix.
 
-        # Skip impossible German letter combinations
-        if len(prefix) >= 1:
-            last_char = prefix[-1].lower()
-
-            # Consonant clusters that are impossible in German
-            impossible_after = {
-                'b': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
-                'c': ['b', 'c', 'd', 'f', 'g', 'j', 'p', 'q', 'v', 'w', 'x', 'y', 'z'],
-                'd': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
-                'f': ['b', 'c', 'd', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
-                'g': ['b', 'c', 'd', 'f', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
-                'k': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
-                'p': ['b', 'c', 'd', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x', 'z'],
-                't': ['b', 'c', 'd', 'f', 'g', 'j', 'k', 'p', 'q', 'v', 'w', 'x'],
-                'x': list("abcdefghijklmnopqrstuvwxyzäöüß"),  # x is very rare in German
-                'q': [c for c in german_chars if c != 'u'],  # q almost always followed by u
-            }
-
-            if last_char in impossible_after:
-                valid_chars = [c for c in german_chars if c not in impossible_after[last_char]]
-                return valid_chars
-
-        return list(german_chars)
-
-    async def explore_house_numbers(self, street: str, number_prefix: str = ""):
-        """Recursively explore all house numbers for a given street and number prefix."""
+        Returns True if the prefix returned a full page and needs to be extended,
+        or None if the request failed.
+        """
         query_key = f"{street}#{number_prefix}"
 
         if query_key in self.completed_number_queries:
-            return
+            return False
 
-        print(f"Exploring house numbers for '{street}' with prefix '{number_prefix}'")
+        if self.explored_number_prefixes % LOG_EVERY == 0:
+            log.info("Explored %d house number prefixes (current: '%s' with prefix '%s')",
+                     self.explored_number_prefixes, street, number_prefix)
+        self.explored_number_prefixes += 1
 
-        house_numbers = await self.fetch_house_numbers(street, number_prefix)
+        house_numbers = self.probed_number_pages.pop(query_key, None)
+        if house_numbers is None:
+            house_numbers = await self.fetch_house_numbers(street, number_prefix)
+        if house_numbers is None:
+            return None
 
         # Add all found house numbers to our collection
-        if street not in self.street_numbers:
-            self.street_numbers[street] = []
-
-        for number in house_numbers:
-            if number not in self.street_numbers[street]:
-                self.street_numbers[street].append(number)
-
-        # If we got exactly 12 results, there might be more
-        if len(house_numbers) == 12:
-            # Generate next digit prefixes (0-9)
-            for digit in "0123456789":
-                new_prefix = number_prefix + digit
-                await self.explore_house_numbers(street, new_prefix)
-        else:
-            # This prefix is complete (less than 12 results)
-            self.completed_number_queries.add(query_key)
+        self.partial_street_numbers.setdefault(street, set()).update(house_numbers)
+
+        # If we got a full page of results, there might be more
+        if len(house_numbers) >= self.number_page_size:
+            return True
+
+        # This prefix is complete (less than a full page of results)
+        self.completed_number_queries.add(query_key)
+        return False
+
+    async def detect_page_size(
+        self, fetch: Callable[[str, int], Awaitable[Optional[List[str]]]], probes: Iterable[str]
+    ) -> Tuple[Optional[int], int, Dict[str, List[str]]]:
+        """Check whether an API honors a custom result limit by fetching probe queries with it.
+
+        Returns the limit to request (None for the default pages), the result count from which
+        a page counts as full, and the successfully fetched probe pages so they can be reused.
+        The server may cap the limit, so only pages shorter than the largest page it actually
+        returned are trusted to be complete.
+        """
+        pages = {}
+        for probe in probes:
+            page = await fetch(probe, CUSTOM_LIMIT)
+            if page is not None:
+                pages[probe] = page
+
+        largest = max((len(page) for page in pages.values()), default=0)
+        # No page longer than the default means the limit is ignored (or can't be told apart)
+        if largest <= DEFAULT_PAGE_SIZE:
+            return None, DEFAULT_PAGE_SIZE, pages
+        return CUSTOM_LIMIT, largest, pages
+
+    async def crawl(
+        self,
+        seeds: Iterable[str],
+        explore: Callable[[str], Awaitable[Optional[bool]]],
+        children: Callable[[str], Iterable[str]],
+        workers: int,
+    ):
+        """Explore prefixes from an explicit stack drained by a pool of concurrent workers."""
+        stack: asyncio.LifoQueue[str] = asyncio.LifoQueue()
+        for seed in seeds:
+            stack.put_nowait(seed)
+
+        async def worker():
+            while True:
+                prefix = await stack.get()
+                try:
+                    if await explore(prefix):
+                        for child in children(prefix):
+                            stack.put_nowait(child)
+                finally:
+                    stack.task_done()
+
+        # Workers only finish by raising, so wait for the stack to drain or the first failure
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        drained = asyncio.ensure_future(stack.join())
+        try:
+            done, _ = await asyncio.wait([drained, *tasks], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in [drained, *tasks]:
+                task.cancel()
+            await asyncio.gather(drained, *tasks, return_exceptions=True)
+
+        # Re-raise a worker's exception
+        for task in done:
+            task.result()
+
+    async def detect_number_limit(self, streets: Iterable[str]):
+        """Check whether the house number API honors a custom result limit.
+
+        If it does, each starting digit of a street is usually complete after a single request.
+        """
+        # Probe the numbers starting with 1 of a sample of streets
+        self.number_limit, self.number_page_size, pages = await self.detect_page_size(
+            lambda street, limit: self.fetch_house_numbers(street, "1", limit=limit), islice(streets, 50)
+        )
+        if self.number_limit:
+            print(f"House number API honors custom limits, pages of {self.number_page_size} count as full")
+
+        # Keep the probe pages, so exploring these streets doesn't request them again
+        for street, numbers in pages.items():
+            self.probed_number_pages[f"{street}#1"] = numbers
+
+    async def crawl_house_numbers(self, street: str, seeds: Iterable[str]) -> bool:
+        """Explore house number prefixes of a street, extending full pages with the next digit (0-9).
+
+        Returns False if any prefix failed, in which case the street's numbers are incomplete.
+        """
+        complete = True
+
+        async def explore(prefix: str) -> Optional[bool]:
+            nonlocal complete
+            result = await self.explore_house_numbers(street, prefix)
+            if result is None:
+                complete = False
+            return result
+
+        await self.crawl(
+            seeds,
+            explore,
+            lambda prefix: (prefix + digit for digit in "0123456789"),
+            workers=self.number_workers,
+        )
+        return complete
 
     async def collect_house_numbers_for_street(self, street: str):
         """Collect all house numbers for a specific street."""
         # Check if this street is already fully processed
         if street in self.street_numbers:
-            print(f"Street '{street}' already processed, skipping...")
+            log.debug("Street '%s' already processed, skipping...", street)
             return
 
         # Start exploration with digit prefixes (1-9) since empty prefix returns nothing
-        for digit in "123456789":
-            await self.explore_house_numbers(street, digit)
+        complete = await self.crawl_house_numbers(street, "123456789")
 
-    async def explore_prefix(self, prefix: str):
-        """Recursively explore all streets with a given prefix."""
-        print(f"Exploring prefix: {prefix}")
+        # Only save fully explored streets, so a resumed run never skips an incomplete one
+        numbers = self.partial_street_numbers.pop(street, set())
+        if not complete:
+            log.warning("Street '%s' has failed requests, it will be retried on the next run", street)
+            return
+        self.street_numbers[street] = numbers
+        self._numbers_log.write(orjson.dumps({"s": street, "n": sorted(numbers)}) + b"\n")
+        self._numbers_log.flush()
+
+    def add_streets(self, streets: List[str]):
+        """Add street names to the collection and the prefix index."""
+        new_streets = set(streets).difference(self.street_names)
+        if not new_streets:
+            return
 
-        streets = await self.fetch_streets(prefix)
+        self.street_names.update(new_streets)
+        self.street_index.update((street.lower(), street) for street in new_streets)
+        self._streets_log.write(b"".join(orjson.dumps(street) + b"\n" for street in new_streets))
 
-        # Add all found streets to our collection
-        for street in streets:
-            self.street_names.add(street)
+    def count_known_streets(self, prefix: str, limit: int) -> int:
+        """Count already known streets starting with a prefix, up to a limit."""
+        key = prefix.lower()
+        if not self.street_index.has_node(key):
+            return 0
+        return sum(1 for _ in islice(self.street_index.iterkeys(prefix=key), limit))
 
-        # If we got exactly 12 results, there might be more
-        if len(streets) == 12:
-            # Generate next characters and explore deeper
-            next_chars = self.get_next_characters(prefix)
+    async def explore_prefix(self, prefix: str) -> Optional[bool]:
+        """Explore the streets with a given prefix.
 
-            for char in next_chars:
-                new_prefix = prefix + char
-                await self.explore_prefix(new_prefix)
-        else:
-            # This prefix is complete (less than 12 results)
-            self.completed_queries.add(prefix)
+        Returns True if the prefix returned a full page and needs to be extended,
+        or None if the request failed; failed prefixes are not recorded as complete.
+        """
+        if prefix in self.completed_queries:
+            return False
+
+        if self.explored_prefixes % LOG_EVERY == 0:
+            log.info("Explored %d street prefixes (current: %s)", self.explored_prefixes, prefix)
+        self.explored_prefixes += 1
+
+        if self.count_known_streets(prefix, self.street_page_size) >= self.street_page_size:
+            # The API would return a full page anyway, so skip the request and go deeper
+            return True
+
+        streets = await self.fetch_streets(prefix)
+        if streets is None:
+            # Left unfinished, so the next run explores this prefix again
+            return None
+        self.add_streets(streets)
+
+        # If we got a full page of results, there might be more
+        if len(streets) >= self.street_page_size:
+            return True
+
+        # This prefix is complete (less than a full page of results)
+        self.complete_prefix(prefix)
+        return False
+
+    def complete_prefix(self, prefix: str):
+        """Record a street prefix whose streets have all been collected."""
+        self.completed_queries.add(prefix)
+        # Make sure the prefix's streets are on disk before it is recorded as complete
+        self._streets_log.flush()
+        self._queries_log.write(orjson.dumps(prefix) + b"\n")
+
+    async def detect_street_limit(self, probes: Iterable[str]):
+        """Check whether the street API honors a custom result limit.
+
+        If it does, prefixes are queried with a large limit so most subtrees need a single request.
+        """
+        self.street_limit, self.street_page_size, pages = await self.detect_page_size(
+            lambda prefix, limit: self.fetch_streets(prefix, limit=limit), probes
+        )
+        if self.street_limit:
+            print(f"Street API honors custom limits, pages of {self.street_page_size} count as full")
+
+        # Reuse the probe pages: short ones are complete, and the streets of full ones
+        # let the crawl skip their request through the known street count
+        for prefix, streets in pages.items():
+            self.add_streets(streets)
+            if len(streets) < self.street_page_size:
+                self.complete_prefix(prefix)
+
+    async def crawl_streets(self, seeds: Iterable[str]):
+        """Explore street prefixes, extending full pages with the valid next characters."""
+        await self.crawl(
+            seeds,
+            self.explore_prefix,
+            lambda prefix: (prefix + char for char in self.get_next_characters(prefix)),
+            workers=self.street_workers,
+        )
 
     async def collect_streets_starting_with(self, letter: str):
         """Collect all streets starting with a specific letter."""
-        await self.explore_prefix(letter)
+        await self.crawl_streets([letter])
 
     def load_existing_data(self):
         """Load existing data from JSON files if they exist."""
         # Load street names
         if os.path.exists("street_names.json"):
-            with open("street_names.json", "r", encoding="utf-8") as f:
-                street_list = json.load(f)
+            with open("street_names.json", "rb") as f:
+                street_list = orjson.loads(f.read())
                 self.street_names = set(street_list)
+                self.street_index.update((street.lower(), street) for street in street_list)
                 print(f"Loaded {len(self.street_names)} existing street names")
 
         # Load completed queries
         if os.path.exists("completed_queries.json"):
-            with open("completed_queries.json", "r", encoding="utf-8") as f:
-                query_list = json.load(f)
+            with open("completed_queries.json", "rb") as f:
+                query_list = orjson.loads(f.read())
                 self.completed_queries = set(query_list)
                 print(f"Loaded {len(self.completed_queries)} existing completed queries")
 
         # Load street numbers
         if os.path.exists("street_numbers.json"):
-            with open("street_numbers.json", "r", encoding="utf-8") as f:
-                self.street_numbers = json.load(f)
+            with open("street_numbers.json", "rb") as f:
+                self.street_numbers = {street: set(numbers) for street, numbers in orjson.loads(f.read()).items()}
                 print(f"Loaded house numbers for {len(self.street_numbers)} streets")
 
+        # Replay results logged since the last save
+        if os.path.exists("street_names.jsonl"):
+            with open("street_names.jsonl", "rb") as f:
+                street_list = [orjson.loads(line) for line in f if line.strip()]
+                self.street_names.update(street_list)
+                self.street_index.update((street.lower(), street) for street in street_list)
+                print(f"Replayed {len(street_list)} logged street names")
+
+        if os.path.exists("completed_queries.jsonl"):
+            with open("completed_queries.jsonl", "rb") as f:
+                query_list = [orjson.loads(line) for line in f if line.strip()]
+                self.completed_queries.update(query_list)
+                print(f"Replayed {len(query_list)} logged completed queries")
+
+        if os.path.exists("street_numbers.jsonl"):
+            with open("street_numbers.jsonl", "rb") as f:
+                records = [orjson.loads(line) for line in f if line.strip()]
+                for record in records:
+                    self.street_numbers.setdefault(record["s"], set()).update(record["n"])
+                print(f"Replayed house numbers for {len(records)} logged streets")
+
     def save_results(self):
         """Save street names, completed queries, and house numbers to JSON files."""
         # Save street names
-        with open("street_names.json", "w", encoding="utf-8") as f:
-            json.dump(sorted(list(self.street_names)), f, ensure_ascii=False, indent=2)
+        with open("street_names.json", "wb") as f:
+            f.write(orjson.dumps(sorted(self.street_names), option=orjson.OPT_INDENT_2))
 
         # Save completed queries
-        with open("completed_queries.json", "w", encoding="utf-8") as f:
-            json.dump(sorted(list(self.completed_queries)), f, ensure_ascii=False, indent=2)
+        with open("completed_queries.json", "wb") as f:
+            f.write(orjson.dumps(sorted(self.completed_queries), option=orjson.OPT_INDENT_2))
 
         # Save street numbers (sort numbers within each street)
         sorted_street_numbers = {}
         for street, numbers in self.street_numbers.items():
             # Sort numbers naturally (handle both numeric and alphanumeric)
-            try:
-                sorted_numbers = sorted(numbers, key=lambda x: (int(''.join(filter(str.isdigit, x)) or '0'), x))
-            except:
-                sorted_numbers = sorted(numbers)
-            sorted_street_numbers[street] = sorted_numbers
+            sorted_street_numbers[street] = sorted(numbers, key=natural_sort_key)
+
+        with open("street_numbers.json", "wb") as f:
+            f.write(orjson.dumps(sorted_street_numbers, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
 
-        with open("street_numbers.json", "w", encoding="utf-8") as f:
-            json.dump(sorted_street_numbers, f, ensure_ascii=False, indent=2)
+        # Everything logged so far is now in the JSON files, so the logs can be compacted
+        self._streets_log.truncate(0)
+        self._numbers_log.truncate(0)
+        self._queries_log.truncate(0)
 
         print(f"Found {len(self.street_names)} unique street names")
         print(f"Completed {len(self.completed_queries)} street query branches")
@@ -203,46 +483,69 @@ class StuttgartStreetFetcher:
         total_house_numbers = sum(len(numbers) for numbers in self.street_numbers.values())
         print(f"Total house numbers collected: {total_house_numbers}")
 
+    async def periodic_save(self, interval: float):
+        """Save the results every interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.save_results()
+
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Close the HTTP session and the result logs."""
+        await close_session()
+        self._streets_log.close()
+        self._numbers_log.close()
+        self._queries_log.close()
 
 
 async def main():
+    logging.basicConfig(level=logging.INFO)
     fetcher = StuttgartStreetFetcher()
 
     try:
         # Load existing data to resume where we left off
         fetcher.load_existing_data()
 
-        # If we don't have street names yet, collect them first
-        if not fetcher.street_names:
-            print("=== COLLECTING STREET NAMES ===")
-            # Collect streets for all letters A-Z and German umlauts
-            letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜ"
+        # Collect the street names first. Completed prefixes and prefixes with enough known
+        # streets are skipped without a request, so a resumed run only retries failed or
+        # unfinished branches.
+        print("=== COLLECTING STREET NAMES ===")
+        # Collect streets for all letters A-Z and German umlauts
+        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜ"
+
+        await fetcher.detect_street_limit(letters)
 
-            for letter in letters:
-                print(f"\n=== Starting collection for letter: {letter} ===")
-                await fetcher.collect_streets_starting_with(letter)
-                print(f"Current total: {len(fetcher.street_names)} streets, {len(fetcher.completed_queries)} completed queries")
+        # Crawl all letters from one stack so all workers stay busy
+        await fetcher.crawl_streets(letters)
 
-            fetcher.save_results()
-            print(f"\n=== STREET COLLECTION COMPLETE ===")
-            print(f"Total unique streets found: {len(fetcher.street_names)}")
+        fetcher.save_results()
+        print(f"\n=== STREET COLLECTION COMPLETE ===")
+        print(f"Total unique streets found: {len(fetcher.street_names)}")
 
         # Now collect house numbers for all streets
         print(f"\n=== COLLECTING HOUSE NUMBERS ===")
         print(f"Processing {len(fetcher.street_names)} streets...")
 
         street_list = sorted(list(fetcher.street_names))
-        for i, street in enumerate(street_list, 1):
-            print(f"\n[{i}/{len(street_list)}] Processing street: {street}")
-            await fetcher.collect_house_numbers_for_street(street)
-
-            # Save progress every 50 streets
-            if i % 50 == 0:
-                fetcher.save_results()
-                print(f"Progress saved - processed {i}/{len(street_list)} streets")
+        await fetcher.detect_number_limit(street for street in street_list if street not in fetcher.street_numbers)
+
+        # Process several streets at once; each street's own requests still share the fetcher's limit
+        sem = asyncio.Semaphore(16)
+
+        async def worker(i: int, street: str):
+            async with sem:
+                log.debug("[%d/%d] Processing street: %s", i, len(street_list), street)
+                await fetcher.collect_house_numbers_for_street(street)
+
+        save_task = asyncio.create_task(fetcher.periodic_save(60))
+        try:
+            # A failing worker cancels the others before the session is closed below
+            async with asyncio.TaskGroup() as group:
+                for i, street in enumerate(street_list, 1):
+                    group.create_task(worker(i, street))
+        finally:
+            save_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await save_task
 
         fetcher.save_results()
         print(f"\n=== FINAL RESULTS ===")